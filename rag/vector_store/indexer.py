@@ -4,17 +4,30 @@ Document Indexer
 Coordinates the document indexing process including loading, chunking, embedding, and storage.
 """
 
+import copy
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import yaml
 import os
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 from ..document_processor import DocumentLoader, TextChunker, TextPreprocessor
 from .embeddings import EmbeddingGenerator
 from .chroma_store import ChromaStore
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4)
+def _parse_config(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file, cached per path and modification time."""
+    with open(config_path, 'r') as file:
+        return yaml.load(file, Loader=SafeLoader)
+
 class DocumentIndexer:
     """Coordinates the document indexing process."""
     
@@ -51,8 +64,8 @@ class DocumentIndexer:
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file."""
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
+            mtime_ns = os.stat(config_path).st_mtime_ns
+            config = copy.deepcopy(_parse_config(config_path, mtime_ns))
             logger.info(f"Loaded configuration from {config_path}")
             return config
         except Exception as e:
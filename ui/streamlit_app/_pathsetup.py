@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Shared sys.path setup for the Streamlit app scripts
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+@lru_cache(maxsize=1)
+def setup():
+    """Add the project root and this directory to sys.path once per process."""
+    current = Path(__file__).parent.absolute()
+    root = current.parent.parent  # Go up to chatbot root
+    
+    for p in (str(root), str(current)):
+        if p not in sys.path:
+            sys.path.insert(0, p)
+    
+    return root
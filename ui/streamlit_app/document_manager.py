@@ -5,26 +5,23 @@ Provides a comprehensive interface for document upload, indexing, and management
 """
 
 import streamlit as st
+import asyncio
+import hashlib
+import json
 import os
 import tempfile
 import shutil
+import threading
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
 import logging
 
-# Add the parent directory to the path for RAG imports
+# Add the project root and this directory to the path for RAG imports
 import sys
+from _pathsetup import setup
 current_dir = Path(__file__).parent.absolute()
-project_root = current_dir.parent.parent  # Go up to chatbot root
-
-# Ensure the project root is first in the path
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
-
-# Also add the current directory for local imports
-if str(current_dir) not in sys.path:
-    sys.path.insert(0, str(current_dir))
+project_root = setup()
 
 # Import RAG wrapper for robust path handling
 try:
@@ -42,6 +39,77 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Largest prefix of a document shown in the viewer
+MAX_VIEW_BYTES = 512 * 1024
+
+# Formats the viewer can show as plain text; PDF and DOCX are binary
+TEXT_VIEW_FORMATS = ('.txt', '.md', '.html', '.htm')
+
+# Files indexed at once; they share one embedding model and Chroma client
+INDEX_CONCURRENCY = 2
+
+# Queries offered in the batch test
+SAMPLE_QUERIES = (
+    "What is machine learning?",
+    "How do I implement a chatbot?",
+    "What are the best practices for AI development?",
+    "Explain the difference between supervised and unsupervised learning"
+)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _list_docs(dir_mtime, dir_str, exts):
+    """List supported documents in a directory.
+    
+    ``dir_mtime`` is only part of the cache key, so adding or removing a file
+    invalidates the cached listing.
+    """
+    
+    documents = []
+    
+    with os.scandir(dir_str) as it:
+        for entry in it:
+            if not entry.is_file() or not entry.name.lower().endswith(exts):
+                continue
+            stat = entry.stat()
+            documents.append({
+                'name': entry.name,
+                'path': entry.path,
+                'size': stat.st_size,
+                'extension': os.path.splitext(entry.name)[1].lower(),
+                'mtime': stat.st_mtime,
+                'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
+            })
+    
+    return sorted(documents, key=lambda x: x['mtime'], reverse=True)
+
+@st.cache_resource
+def _collection_state():
+    """Collection version and manifest lock shared by every session in this process."""
+    return {'version': 0, 'lock': threading.Lock(), 'manifest_lock': threading.Lock()}
+
+class _QueryFailed(Exception):
+    """Carries a pipeline error result out of the cache without storing it."""
+    
+    def __init__(self, result):
+        super().__init__(result['metadata']['error'])
+        self.result = result
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_query(query, top_k, collection_version, chunk_count, _pipeline):
+    """Run a RAG query, memoized on the query, top_k and collection state.
+    
+    ``collection_version`` is bumped by this app's uploads and deletes;
+    ``chunk_count`` also catches documents indexed elsewhere, such as the
+    RAG sidebar in my_app. ``_pipeline`` is excluded from the cache key by
+    its leading underscore. Error results are raised as ``_QueryFailed`` so
+    a transient failure is never cached.
+    """
+    
+    result = _pipeline.query(query)
+    if result.get('metadata', {}).get('error'):
+        raise _QueryFailed(result)
+    return result
+
 class DocumentManager:
     """Manages document upload, indexing, and management for RAG system."""
     
@@ -52,6 +120,8 @@ class DocumentManager:
         self.embeddings_dir = self.base_dir / "rag" / "data" / "embeddings"
         self.config_path = get_robust_config_path() if RAG_AVAILABLE else self.base_dir / "rag" / "config" / "rag_config.yaml"
         self.supported_formats = ['.pdf', '.txt', '.docx', '.md', '.html', '.htm']
+        self._ext_tuple = tuple(self.supported_formats)
+        self.manifest_path = self.embeddings_dir / "manifest.json"
         
         # Ensure correct working directory
         if RAG_AVAILABLE:
@@ -96,7 +166,7 @@ class DocumentManager:
         st.markdown("#### Upload Documents")
         uploaded_files = st.file_uploader(
             "Choose documents to upload and index",
-            type=['pdf', 'txt', 'docx', 'md', 'html', 'htm'],
+            type=[ext.lstrip('.') for ext in self._ext_tuple],
             accept_multiple_files=True,
             help="Select one or more documents to add to your knowledge base"
         )
@@ -105,15 +175,11 @@ class DocumentManager:
             st.info(f"📄 Selected {len(uploaded_files)} document(s)")
             
             # Show file details
-            file_details = []
-            for file in uploaded_files:
-                file_details.append({
-                    'Name': file.name,
-                    'Size': f"{file.size / 1024:.1f} KB",
-                    'Type': file.type or 'Unknown'
-                })
-            
-            st.dataframe(pd.DataFrame(file_details))
+            st.dataframe({
+                'Name': [f.name for f in uploaded_files],
+                'Size (KB)': [round(f.size / 1024, 1) for f in uploaded_files],
+                'Type': [f.type or 'Unknown' for f in uploaded_files]
+            })
         
         # Indexing options
         st.markdown("#### Indexing Options")
@@ -166,50 +232,51 @@ class DocumentManager:
             st.info("📚 No documents found. Upload some documents to get started!")
             return
         
+        # Build the table once and reuse it for metrics and display
+        df = pd.DataFrame(existing_docs)
+        df['size_kb'] = (df['size'] / 1024).round(1)
+        df['modified'] = pd.to_datetime(df['modified'])
+        
         # Document statistics
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Documents", len(existing_docs))
+            st.metric("Total Documents", len(df))
         
         with col2:
-            total_size = sum(doc['size'] for doc in existing_docs)
+            total_size = df['size'].sum()
             st.metric("Total Size", f"{total_size / 1024:.1f} KB")
         
         with col3:
-            formats = set(doc['extension'] for doc in existing_docs)
-            st.metric("File Types", len(formats))
+            st.metric("File Types", df['extension'].nunique())
         
         # Document list
         st.markdown("#### Document List")
         
-        # Create dataframe for display
-        df = pd.DataFrame(existing_docs)
-        df['Actions'] = '🔍 View | 🗑️ Delete'
+        st.dataframe(
+            df[['name', 'size_kb', 'extension', 'modified']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'name': "Name",
+                'size_kb': "Size (KB)",
+                'extension': "Type",
+                'modified': st.column_config.DatetimeColumn("Added", format="YYYY-MM-DD HH:mm"),
+            }
+        )
         
-        # Display documents
-        for i, doc in enumerate(existing_docs):
-            col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 2])
-            
-            with col1:
-                st.write(f"**{doc['name']}**")
-                st.caption(f"Added: {doc['modified']}")
-            
-            with col2:
-                st.write(f"{doc['size'] / 1024:.1f} KB")
-            
-            with col3:
-                st.write(doc['extension'])
-            
-            with col4:
-                if st.button(f"View {i}", key=f"view_{i}"):
-                    self.view_document(doc['path'])
-            
-            with col5:
-                if st.button(f"Delete {i}", key=f"delete_{i}"):
-                    self.delete_document(doc['path'])
-            
-            st.divider()
+        # View a single selected document
+        selected = st.selectbox("Act on:", df['name'])
+        selected_path = df.loc[df['name'] == selected, 'path'].iat[0]
+        
+        if st.button("🔍 View", key="view_selected"):
+            self.view_document(selected_path)
+        
+        # Queue deletions and flush them with a single rerun
+        to_delete = st.multiselect("Select documents to delete", df['name'], key="delete_selection")
+        
+        if to_delete and st.button("🗑️ Delete Selected"):
+            self.delete_documents(df.loc[df['name'].isin(to_delete), 'path'].tolist())
     
     def render_search_test_tab(self):
         """Render the search and test tab."""
@@ -233,17 +300,10 @@ class DocumentManager:
         # Batch testing
         st.markdown("#### Batch Testing")
         
-        sample_queries = [
-            "What is machine learning?",
-            "How do I implement a chatbot?",
-            "What are the best practices for AI development?",
-            "Explain the difference between supervised and unsupervised learning"
-        ]
-        
         selected_queries = st.multiselect(
             "Select queries to test",
-            sample_queries,
-            default=sample_queries[:2]
+            SAMPLE_QUERIES,
+            default=SAMPLE_QUERIES[:2]
         )
         
         if selected_queries and st.button("🧪 Run Batch Test"):
@@ -315,71 +375,168 @@ class DocumentManager:
             return
         
         try:
-            with st.spinner("🚀 Indexing documents..."):
-                # Initialize RAG pipeline with robust path handling
-                rag_pipeline = RobustRAGPipeline()
+            with st.status("🚀 Indexing documents...", expanded=True) as status:
+                rag_pipeline = self._get_rag_pipeline()
                 
-                # Save uploaded files
+                # Save uploaded files, skipping content that is already indexed
+                manifest_lock = _collection_state()['manifest_lock']
                 saved_files = []
-                for uploaded_file in uploaded_files:
-                    file_path = self.documents_dir / uploaded_file.name
-                    
-                    # Save file
-                    with open(file_path, 'wb') as f:
-                        f.write(uploaded_file.getvalue())
+                file_hashes = {}
+                with manifest_lock:
+                    manifest = self._load_manifest()
+                    for uploaded_file in uploaded_files:
+                        content_hash = self._content_hash(uploaded_file)
+                        entry = manifest.get(content_hash)
+                        if entry and Path(entry['path']).exists():
+                            status.write(f"⏭️ {uploaded_file.name}: Already indexed")
+                            continue
+                        
+                        file_path = self.documents_dir / uploaded_file.name
+                        
+                        # The file is about to be overwritten, so whatever content
+                        # the manifest recorded at this path no longer lives there
+                        manifest = {
+                            h: e for h, e in manifest.items()
+                            if str(Path(e['path'])) != str(file_path)
+                        }
+                        
+                        # Stream the upload to disk in 1MB chunks
+                        uploaded_file.seek(0)
+                        with open(file_path, 'wb') as f:
+                            shutil.copyfileobj(uploaded_file, f, length=1 << 20)
+                        
+                        saved_files.append(str(file_path))
+                        file_hashes[str(file_path)] = content_hash
                     
-                    saved_files.append(str(file_path))
+                    if saved_files:
+                        self._save_manifest(manifest)
                 
-                # Index documents
-                results = rag_pipeline.index_documents(saved_files)
+                if not saved_files:
+                    status.update(label="All documents already indexed", state="complete", expanded=False)
+                    return
+                
+                # Index documents in worker threads, reporting each file as it finishes
+                results = asyncio.run(self._index_files_async(rag_pipeline, saved_files, status))
+                
+                # Record successfully indexed content in the manifest, re-reading
+                # it so entries written by other sessions meanwhile are kept
+                indexed_at = datetime.now().isoformat()
+                with manifest_lock:
+                    manifest = self._load_manifest()
+                    for result in results:
+                        if result.get('status') == 'success':
+                            manifest[file_hashes[result['file_path']]] = {
+                                'path': result['file_path'],
+                                'indexed_at': indexed_at,
+                                'n_chunks': result.get('chunks_created', 0)
+                            }
+                    self._save_manifest(manifest)
                 
-                # Show results
                 success_count = sum(1 for r in results if r.get('status') == 'success')
                 error_count = len(results) - success_count
                 
                 if success_count > 0:
-                    st.success(f"✅ Successfully indexed {success_count} documents!")
-                
-                if error_count > 0:
-                    st.error(f"❌ Failed to index {error_count} documents")
+                    self._bump_collection_version()
                 
-                # Show detailed results
-                with st.expander("📊 Indexing Details"):
-                    for result in results:
-                        if result.get('status') == 'success':
-                            st.write(f"✅ {result.get('file_name', 'Unknown')}: {result.get('chunks_created', 0)} chunks")
-                        else:
-                            st.write(f"❌ {result.get('file_path', 'Unknown')}: {result.get('error', 'Unknown error')}")
+                status.update(
+                    label=f"Indexed {success_count}/{len(results)} documents",
+                    state="error" if error_count else "complete",
+                    expanded=False
+                )
+            
+            # Show results
+            if success_count > 0:
+                st.success(f"✅ Successfully indexed {success_count} documents!")
+            
+            if error_count > 0:
+                st.error(f"❌ Failed to index {error_count} documents")
                 
         except Exception as e:
             st.error(f"❌ Error indexing documents: {str(e)}")
             logger.error(f"Indexing error: {str(e)}")
     
+    async def _index_files_async(self, rag_pipeline, saved_files, status):
+        """Index files concurrently and write per-file progress to the status container."""
+        
+        # Bound the number of CPU-bound encode calls running at the same time
+        semaphore = asyncio.Semaphore(INDEX_CONCURRENCY)
+        
+        async def index_one(path):
+            async with semaphore:
+                return await asyncio.to_thread(rag_pipeline.index_documents, [path])
+        
+        tasks = [index_one(path) for path in saved_files]
+        
+        results = []
+        for i, task in enumerate(asyncio.as_completed(tasks), start=1):
+            result = (await task)[0]
+            results.append(result)
+            
+            if result.get('status') == 'success':
+                status.write(f"✅ {result.get('file_name', 'Unknown')}: {result.get('chunks_created', 0)} chunks")
+            else:
+                status.write(f"❌ {result.get('file_path', 'Unknown')}: {result.get('error', 'Unknown error')}")
+            status.update(label=f"Indexed {i}/{len(saved_files)}")
+        
+        return results
+    
+    @staticmethod
+    def _content_hash(fileobj):
+        """Hash a file-like object's contents in 1MB chunks."""
+        
+        digest = hashlib.blake2b(digest_size=16)
+        fileobj.seek(0)
+        for chunk in iter(lambda: fileobj.read(1 << 20), b''):
+            digest.update(chunk)
+        fileobj.seek(0)
+        return digest.hexdigest()
+    
+    def _load_manifest(self):
+        """Load the content-hash manifest of indexed documents."""
+        
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {str(e)}")
+            return {}
+    
+    def _save_manifest(self, manifest):
+        """Atomically write the content-hash manifest."""
+        
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
     def get_existing_documents(self):
         """Get list of existing documents."""
         
-        documents = []
-        
-        if self.documents_dir.exists():
-            for file_path in self.documents_dir.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in self.supported_formats:
-                    stat = file_path.stat()
-                    documents.append({
-                        'name': file_path.name,
-                        'path': str(file_path),
-                        'size': stat.st_size,
-                        'extension': file_path.suffix.lower(),
-                        'modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                    })
+        # One stat() both checks existence and provides the cache key
+        try:
+            dir_mtime = os.stat(self.documents_dir).st_mtime
+        except FileNotFoundError:
+            return []
         
-        return sorted(documents, key=lambda x: x['modified'], reverse=True)
+        return _list_docs(dir_mtime, str(self.documents_dir), self._ext_tuple)
     
     def view_document(self, file_path):
         """View document content."""
         
+        if Path(file_path).suffix.lower() not in TEXT_VIEW_FORMATS:
+            st.info(f"Preview is not available for {Path(file_path).suffix.lower()} files.")
+            return
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                raw = f.read(MAX_VIEW_BYTES)
+            
+            content = raw.decode('utf-8', errors='replace')
+            if size > MAX_VIEW_BYTES:
+                content += f"\n\n... [truncated {size - MAX_VIEW_BYTES} bytes]"
             
             st.markdown("### 📄 Document Content")
             st.text_area("Content", content, height=400)
@@ -387,15 +544,65 @@ class DocumentManager:
         except Exception as e:
             st.error(f"Error reading document: {str(e)}")
     
-    def delete_document(self, file_path):
-        """Delete a document."""
+    def delete_documents(self, file_paths):
+        """Delete a batch of documents and rerun once."""
+        
+        deleted = set()
+        for file_path in file_paths:
+            try:
+                Path(file_path).unlink(missing_ok=True)
+                deleted.add(str(Path(file_path)))
+            except Exception as e:
+                st.error(f"Error deleting document {Path(file_path).name}: {str(e)}")
+        
+        if deleted:
+            # Forget deleted content so re-uploading the same file indexes it again
+            with _collection_state()['manifest_lock']:
+                manifest = self._load_manifest()
+                kept = {h: entry for h, entry in manifest.items() if str(Path(entry['path'])) not in deleted}
+                if len(kept) != len(manifest):
+                    self._save_manifest(kept)
+            
+            _list_docs.clear()
+            self._bump_collection_version()
+            st.session_state.pop("delete_selection", None)
+            st.rerun()
+    
+    def _get_rag_pipeline(self):
+        """Get the session's RAG pipeline, creating it on first use."""
+        
+        if 'rag_pipeline' not in st.session_state:
+            # Initialize RAG pipeline with robust path handling
+            st.session_state.rag_pipeline = RobustRAGPipeline()
+        return st.session_state.rag_pipeline
+    
+    def _bump_collection_version(self):
+        """Invalidate cached query results after the collection changes."""
+        
+        state = _collection_state()
+        with state['lock']:
+            state['version'] += 1
+    
+    def _query(self, query):
+        """Run a RAG query through the result cache."""
         
+        rag_pipeline = self._get_rag_pipeline()
         try:
-            os.remove(file_path)
-            st.success(f"✅ Document deleted: {Path(file_path).name}")
-            st.rerun()
-        except Exception as e:
-            st.error(f"Error deleting document: {str(e)}")
+            chunk_count = rag_pipeline.retriever.vector_store.collection.count()
+        except Exception:
+            chunk_count = None
+        
+        try:
+            return _cached_query(
+                query,
+                rag_pipeline.retriever.top_k,
+                _collection_state()['version'],
+                chunk_count,
+                rag_pipeline
+            )
+        except _QueryFailed as e:
+            # Show this session the failure without caching it for others
+            return e.result
     
     def test_document_search(self, query):
         """Test document search."""
@@ -406,8 +613,7 @@ class DocumentManager:
         
         try:
             with st.spinner("🔍 Searching documents..."):
-                rag_pipeline = RobustRAGPipeline()
-                results = rag_pipeline.query(query)
+                results = self._query(query)
                 
                 if results.get('metadata', {}).get('has_context', False):
                     st.success(f"✅ Found {results['metadata']['documents_retrieved']} relevant documents")
@@ -434,11 +640,9 @@ class DocumentManager:
         
         try:
             with st.spinner("🧪 Running batch test..."):
-                rag_pipeline = RobustRAGPipeline()
-                
                 results = []
                 for query in queries:
-                    result = rag_pipeline.query(query)
+                    result = self._query(query)
                     results.append({
                         'Query': query,
                         'Documents Found': result.get('metadata', {}).get('documents_retrieved', 0),
@@ -3,14 +3,19 @@
 Final verification that all path issues are resolved
 """
 
+import importlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Setup paths
-current_dir = Path(__file__).parent.absolute()
-project_root = current_dir.parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(current_dir))
+from _pathsetup import setup
+project_root = setup()
+
+def _init_document_manager():
+    """Import and construct the document manager."""
+    from document_manager import DocumentManager
+    return DocumentManager()
 
 def test_all_components():
     """Test all components with robust wrapper."""
@@ -37,38 +42,28 @@ def test_all_components():
         print(f"❌ Test 2: Config path resolution failed: {e}")
         return False
     
-    # Test 3: RAG Pipeline initialization
-    try:
-        pipeline = RobustRAGPipeline()
-        print("✅ Test 3: RAG Pipeline initialization successful")
-    except Exception as e:
-        print(f"❌ Test 3: RAG Pipeline initialization failed: {e}")
-        return False
+    # Tests 3-6 load models and heavy modules independently, so run them concurrently
+    checks = [
+        ("Test 3: RAG Pipeline initialization", RobustRAGPipeline),
+        ("Test 4: Streamlit RAG Integration", RobustStreamlitRAGIntegration),
+        ("Test 5: Document Manager initialization", _init_document_manager),
+        ("Test 6: Enhanced app import", lambda: importlib.import_module("my_app")),
+    ]
     
-    # Test 4: Streamlit RAG Integration
-    try:
-        integration = RobustStreamlitRAGIntegration()
-        print("✅ Test 4: Streamlit RAG Integration successful")
-    except Exception as e:
-        print(f"❌ Test 4: Streamlit RAG Integration failed: {e}")
-        return False
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(check) for _, check in checks]
     
-    # Test 5: Document Manager
-    try:
-        from document_manager import DocumentManager
-        dm = DocumentManager()
-        print("✅ Test 5: Document Manager initialization successful")
-    except Exception as e:
-        print(f"❌ Test 5: Document Manager initialization failed: {e}")
-        return False
+    # Report in the original order
+    outcomes = []
+    for (label, _), future in zip(checks, futures):
+        try:
+            outcomes.append(future.result())
+            print(f"✅ {label} successful")
+        except Exception as e:
+            print(f"❌ {label} failed: {e}")
+            return False
     
-    # Test 6: Enhanced App Import
-    try:
-        import my_app
-        print("✅ Test 6: Enhanced app import successful")
-    except Exception as e:
-        print(f"❌ Test 6: Enhanced app import failed: {e}")
-        return False
+    pipeline = outcomes[0]
     
     # Test 7: Document indexing functionality
     try:
@@ -4,13 +4,9 @@ RAG Database Configuration
 Connect through our RAG system
 """
 
-import sys
-from pathlib import Path
-
 # Setup paths
-current_dir = Path(__file__).parent.absolute()
-project_root = current_dir.parent.parent
-sys.path.insert(0, str(project_root))
+from _pathsetup import setup
+project_root = setup()
 
 def get_database_config():
     """Get complete database configuration."""
@@ -4,75 +4,88 @@ Wrapper for RAG components that ensures correct paths are always used
 """
 
 import os
-import sys
 from pathlib import Path
 
 # Setup paths
-current_dir = Path(__file__).parent.absolute()
-project_root = current_dir.parent.parent
-sys.path.insert(0, str(project_root))
+from _pathsetup import setup
+project_root = setup()
 
 # Set the correct config path
 CORRECT_CONFIG_PATH = str(project_root / "rag" / "config" / "rag_config.yaml")
 
-class RobustRAGPipeline:
-    """Wrapper around RAGPipeline that ensures correct config path."""
+class _RobustWrapperBase:
+    """Shared config resolution and delegation for the robust wrappers."""
     
-    def __init__(self, config_path=None):
-        """Initialize with robust path handling."""
-        if config_path is None or not Path(config_path).exists():
-            config_path = CORRECT_CONFIG_PATH
+    # Name of the instance attribute holding the wrapped object
+    _delegate_name = None
+    
+    @staticmethod
+    def _resolve_config(config_path=None):
+        """Resolve a config path to an existing absolute path."""
+        resolved = Path(config_path) if config_path is not None else None
+        exists = resolved is not None and resolved.exists()
+        if not exists:
+            resolved = Path(CORRECT_CONFIG_PATH)
+            exists = resolved.exists()
         
         # Ensure the config path is absolute
-        if not Path(config_path).is_absolute():
-            config_path = str(project_root / config_path)
+        if not resolved.is_absolute():
+            resolved = project_root / resolved
+            exists = resolved.exists()
         
         # Verify the config file exists
-        if not Path(config_path).exists():
-            raise FileNotFoundError(f"Config file not found: {config_path}")
+        if not exists:
+            raise FileNotFoundError(f"Config file not found: {resolved}")
         
-        print(f"🔧 Using config path: {config_path}")
+        print(f"🔧 Using config path: {resolved}")
+        return str(resolved)
+    
+    def __getattr__(self, name):
+        """Delegate all method calls to the wrapped object.
+        
+        Bound methods are cached on the wrapper so later lookups go through
+        the normal instance ``__dict__`` path. Data attributes are always read
+        from the wrapped object, because they can change after the first read.
+        """
+        if name == self._delegate_name:
+            raise AttributeError(name)
+        attr = getattr(getattr(self, self._delegate_name), name)
+        if callable(attr):
+            object.__setattr__(self, name, attr)
+        return attr
+
+class RobustRAGPipeline(_RobustWrapperBase):
+    """Wrapper around RAGPipeline that ensures correct config path."""
+    
+    _delegate_name = '_pipeline'
+    
+    def __init__(self, config_path=None):
+        """Initialize with robust path handling."""
+        cfg = self._resolve_config(config_path)
         
         # Import and initialize the real RAGPipeline
         from rag.integration.rag_pipeline import RAGPipeline
-        self._pipeline = RAGPipeline(config_path)
-    
-    def __getattr__(self, name):
-        """Delegate all method calls to the wrapped pipeline."""
-        return getattr(self._pipeline, name)
+        self._pipeline = RAGPipeline(cfg)
 
-class RobustStreamlitRAGIntegration:
+class RobustStreamlitRAGIntegration(_RobustWrapperBase):
     """Wrapper around StreamlitRAGIntegration that ensures correct config path."""
     
+    _delegate_name = '_integration'
+    
     def __init__(self, config_path=None):
         """Initialize with robust path handling."""
-        if config_path is None or not Path(config_path).exists():
-            config_path = CORRECT_CONFIG_PATH
-        
-        # Ensure the config path is absolute
-        if not Path(config_path).is_absolute():
-            config_path = str(project_root / config_path)
-        
-        # Verify the config file exists
-        if not Path(config_path).exists():
-            raise FileNotFoundError(f"Config file not found: {config_path}")
-        
-        print(f"🔧 Using config path: {config_path}")
+        cfg = self._resolve_config(config_path)
         
         # Import and initialize the real StreamlitRAGIntegration
         from rag.integration.streamlit_rag import StreamlitRAGIntegration
-        self._integration = StreamlitRAGIntegration(config_path)
-    
-    def __getattr__(self, name):
-        """Delegate all method calls to the wrapped integration."""
-        return getattr(self._integration, name)
+        self._integration = StreamlitRAGIntegration(cfg)
 
 # Also create a function that ensures the working directory is correct
 def ensure_correct_working_directory():
     """Ensure we're working from the correct directory."""
     # Don't change working directory when running in Streamlit
     # Instead, just ensure the config path is accessible
-    if not Path("rag/config/rag_config.yaml").exists():
+    if not os.path.exists("rag/config/rag_config.yaml"):
         # Only change directory if we're not in a Streamlit context
         import sys
         if 'streamlit' not in sys.modules:
@@ -3,17 +3,13 @@
 Simple script to run the document manager with proper path setup
 """
 
-import sys
 import os
 from pathlib import Path
 
 # Set up paths
+from _pathsetup import setup
 current_dir = Path(__file__).parent.absolute()
-project_root = current_dir.parent.parent
-
-# Add to Python path
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(current_dir))
+project_root = setup()
 
 # Set working directory
 os.chdir(current_dir)
@@ -23,23 +19,21 @@ print(f"   Project root: {project_root}")
 print(f"   Current dir: {current_dir}")
 print(f"   Python path set correctly")
 
-# Import and run
+# Replace this process with streamlit
 try:
-    import streamlit.web.cli as stcli
-    import sys
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(project_root), str(current_dir), env.get("PYTHONPATH", "")) if p
+    )
     
-    # Set up arguments for streamlit
-    sys.argv = [
+    os.execvpe("streamlit", [
         "streamlit",
         "run",
         "my_app.py",
         "--server.port=8504",
         "--server.headless=false",
         "--browser.gatherUsageStats=false"
-    ]
-    
-    # Run streamlit
-    stcli.main()
+    ], env)
     
 except Exception as e:
     print(f"❌ Error starting app: {str(e)}")
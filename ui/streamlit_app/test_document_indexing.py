@@ -6,6 +6,7 @@ Verifies that the document manager can properly index documents
 
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Add the parent directory to the path for RAG imports
@@ -19,12 +20,17 @@ except ImportError as e:
     print(f"❌ Import error: {str(e)}")
     sys.exit(1)
 
+@lru_cache(maxsize=1)
+def _get_dm():
+    """Create the shared DocumentManager used by all tests."""
+    return DocumentManager()
+
 def test_document_manager():
     """Test the document manager initialization."""
     print("\n🔍 Testing Document Manager...")
     
     try:
-        dm = DocumentManager()
+        dm = _get_dm()
         print(f"✅ Document Manager initialized")
         print(f"   Documents dir: {dm.documents_dir}")
         print(f"   Embeddings dir: {dm.embeddings_dir}")
@@ -54,12 +60,12 @@ def test_rag_pipeline():
         print(f"❌ RAG Pipeline error: {str(e)}")
         return None
 
-def test_existing_documents():
+def test_existing_documents(dm=None):
     """Test listing existing documents."""
     print("\n🔍 Testing existing documents...")
     
     try:
-        dm = DocumentManager()
+        dm = dm or _get_dm()
         documents = dm.get_existing_documents()
         
         print(f"✅ Found {len(documents)} existing documents:")
@@ -71,12 +77,12 @@ def test_existing_documents():
         print(f"❌ Error listing documents: {str(e)}")
         return []
 
-def test_document_search():
+def test_document_search(dm=None):
     """Test document search functionality."""
     print("\n🔍 Testing document search...")
     
     try:
-        dm = DocumentManager()
+        dm = dm or _get_dm()
         
         # Test query
         test_query = "What is machine learning?"
@@ -109,10 +115,10 @@ def main():
         return False
     
     # Test existing documents
-    documents = test_existing_documents()
+    documents = test_existing_documents(dm)
     
     # Test document search
-    search_works = test_document_search()
+    search_works = test_document_search(dm)
     
     # Summary
     print("\n" + "=" * 50)
@@ -5,6 +5,8 @@ Comprehensive verification script for the document manager setup
 
 import sys
 import os
+import ast
+import importlib.util
 from pathlib import Path
 import subprocess
 
@@ -21,22 +23,32 @@ def setup_paths():
     return current_dir, project_root
 
 def test_imports():
-    """Test all necessary imports."""
+    """Test that all necessary modules exist and define their classes.
+    
+    Source files are located and parsed directly rather than imported, since
+    importing any ``rag.*`` module runs ``rag/__init__`` and loads the whole
+    pipeline.
+    """
     print("🧪 Testing imports...")
     
+    current_dir, project_root = setup_paths()
     tests = [
-        ("RAG Pipeline", "rag.integration.rag_pipeline", "RAGPipeline"),
-        ("Streamlit RAG", "rag.integration.streamlit_rag", "StreamlitRAGIntegration"),
-        ("ChromaStore", "rag.vector_store.chroma_store", "ChromaStore"),
-        ("Document Loader", "rag.document_processor.loader", "DocumentLoader"),
-        ("Document Manager", "document_manager", "DocumentManager"),
+        ("RAG Pipeline", project_root / "rag" / "integration" / "rag_pipeline.py", "RAGPipeline"),
+        ("Streamlit RAG", project_root / "rag" / "integration" / "streamlit_rag.py", "StreamlitRAGIntegration"),
+        ("ChromaStore", project_root / "rag" / "vector_store" / "chroma_store.py", "ChromaStore"),
+        ("Document Loader", project_root / "rag" / "document_processor" / "loader.py", "DocumentLoader"),
+        ("Document Manager", current_dir / "document_manager.py", "DocumentManager"),
     ]
     
     results = []
-    for name, module, class_name in tests:
+    for name, path, class_name in tests:
         try:
-            mod = __import__(module, fromlist=[class_name])
-            getattr(mod, class_name)
+            if not path.exists():
+                raise ImportError(f"No module at '{path}'")
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+            classes = {node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)}
+            if class_name not in classes:
+                raise ImportError(f"'{class_name}' not defined in '{path.name}'")
             print(f"   ✅ {name}")
             results.append(True)
         except ImportError as e:
@@ -88,13 +100,16 @@ def test_directories():
     return all(results)
 
 def test_streamlit_app():
-    """Test if the Streamlit app can be imported."""
+    """Test if the Streamlit app can be found and parsed."""
     print("\n🌐 Testing Streamlit app...")
     
     try:
-        # Try to import the app without running it
-        import my_app
-        print("   ✅ Enhanced app imports successfully")
+        # Locate and parse the app without executing it
+        spec = importlib.util.find_spec("my_app")
+        if spec is None or spec.origin is None:
+            raise ImportError("No module named 'my_app'")
+        ast.parse(Path(spec.origin).read_text(encoding="utf-8"), filename=spec.origin)
+        print("   ✅ Enhanced app found and parses successfully")
         return True
     except Exception as e:
         print(f"   ❌ Enhanced app import failed: {e}")
@@ -0,0 +1,27 @@
+"""
+Collection settings shared by the ChromaDB playground and its sample-data script
+"""
+
+# Sentence-transformers model used for sample data and text queries
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+
+# Largest number of results the search tab can request
+MAX_TOP_K = 10
+
+# HNSW index parameters, applied when the collection is created; search_ef
+# trades recall for latency and is sized well above the largest top_k
+SEARCH_EF = max(64, 4 * MAX_TOP_K)
+HNSW_PARAMS = {
+    "hnsw:M": 24,
+    "hnsw:construction_ef": 128,
+    "hnsw:search_ef": SEARCH_EF
+}
+
+# All stored and query vectors are L2-normalized, so inner product equals
+# cosine similarity without the per-distance norm computation.
+# ChromaDB reports "ip" distances as 1 - dot, so similarity = 1 - distance.
+COLLECTION_METADATA = {"hnsw:space": "ip", **HNSW_PARAMS}
+
+# Collection holding the playground vectors
+COLLECTION_NAME = "playground_vectors"
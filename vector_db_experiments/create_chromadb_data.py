@@ -10,6 +10,21 @@ import os
 from datetime import datetime
 import json
 
+# Shared with the playground so stored and query vectors share one space
+from chromadb_settings import (
+    EMBEDDING_MODEL, EMBEDDING_DIM, COLLECTION_METADATA, COLLECTION_NAME
+)
+
+_encoder = None
+
+def get_encoder():
+    """Load the sentence-transformers model once."""
+    global _encoder
+    if _encoder is None:
+        from sentence_transformers import SentenceTransformer
+        _encoder = SentenceTransformer(EMBEDDING_MODEL)
+    return _encoder
+
 def init_chromadb():
     """Initialize ChromaDB client."""
     try:
@@ -24,10 +39,10 @@ def init_chromadb():
             )
         )
         
-        # Get or create collection
+        # Get or create collection with the playground's index settings
         collection = client.get_or_create_collection(
-            name="playground_vectors",
-            metadata={"hnsw:space": "cosine"}
+            name=COLLECTION_NAME,
+            metadata=COLLECTION_METADATA
         )
         
         return client, collection
@@ -35,6 +50,27 @@ def init_chromadb():
         print(f"Failed to initialize ChromaDB: {str(e)}")
         return None, None
 
+def clear_collection(client, collection):
+    """Remove all vectors, keeping the collection and its HNSW settings.
+    
+    The collection is emptied in place so running playground sessions keep a
+    valid handle; it is only dropped and recreated when it holds vectors of
+    another dimension, which ChromaDB would otherwise reject on add.
+    """
+    results = collection.get(limit=1, include=["embeddings"])
+    embeddings = results.get('embeddings')
+    if embeddings is not None and len(embeddings) > 0 and len(embeddings[0]) != EMBEDDING_DIM:
+        client.delete_collection(COLLECTION_NAME)
+        return client.get_or_create_collection(
+            name=COLLECTION_NAME,
+            metadata=COLLECTION_METADATA
+        )
+    
+    ids = collection.get(include=[])['ids']
+    if ids:
+        collection.delete(ids=ids)
+    return collection
+
 def create_ai_ml_data():
     """Create AI/ML related data."""
     return [
@@ -300,37 +336,32 @@ def create_software_engineering_data():
         }
     ]
 
-def generate_embeddings(text, seed=None):
-    """Generate simulated embeddings for text."""
-    if seed is not None:
-        np.random.seed(seed)
-    
-    # Create a deterministic vector based on text content
-    text_hash = hash(text) % (2**32)
-    np.random.seed(text_hash)
-    
-    # Generate 128-dimensional vector
-    vector = np.random.randn(128)
-    vector = vector / np.linalg.norm(vector)  # Normalize
-    
-    return vector.tolist()
+def generate_embeddings(texts):
+    """Embed texts as unit-norm vectors with the playground's encoder."""
+    embeddings = get_encoder().encode(
+        texts,
+        batch_size=32,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    return embeddings.astype(np.float32).tolist()
 
 def create_sample_data():
     """Create comprehensive sample data for ChromaDB."""
     print("🚀 Creating sample data for ChromaDB playground...")
     
-    # Initialize ChromaDB
+    # Initialize ChromaDB and clear any existing data
     client, collection = init_chromadb()
     if not collection:
         print("❌ Failed to initialize ChromaDB")
         return False
     
-    # Clear existing data
     try:
-        collection.delete(where={})
+        collection = clear_collection(client, collection)
         print("🗑️ Cleared existing data")
-    except:
-        pass
+    except Exception as e:
+        print(f"❌ Error clearing existing data: {str(e)}")
+        return False
     
     # Collect all data
     all_data = []
@@ -343,17 +374,12 @@ def create_sample_data():
     print(f"📊 Generated {len(all_data)} data points across 5 categories")
     
     # Prepare data for ChromaDB
-    vectors = []
+    vectors = generate_embeddings([data["text"] for data in all_data])
     ids = []
     metadatas = []
     
     for i, data in enumerate(all_data):
         vector_id = f"doc_{i:03d}"
-        
-        # Generate embedding
-        vector = generate_embeddings(data["text"], seed=i)
-        
-        vectors.append(vector)
         ids.append(vector_id)
         
         # Create metadata
@@ -363,7 +389,7 @@ def create_sample_data():
             'subcategory': data["subcategory"],
             'difficulty': data["difficulty"],
             'created_at': datetime.now().isoformat(),
-            'vector_dim': 128,
+            'vector_dim': EMBEDDING_DIM,
             'doc_id': vector_id
         }
         metadatas.append(metadata)
@@ -432,7 +458,7 @@ def test_search():
         print(f"\n🔎 Searching for: '{query}'")
         
         # Generate query vector
-        query_vector = generate_embeddings(query)
+        query_vector = generate_embeddings([query])[0]
         
         # Search
         results = collection.query(
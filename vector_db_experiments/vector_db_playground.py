@@ -7,12 +7,21 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.manifold import TSNE
-from sklearn.metrics.pairwise import cosine_similarity
+import hashlib
+import os
+import tempfile
 import json
 import time
 from datetime import datetime
+from pathlib import Path
+from functools import lru_cache
+from importlib.util import find_spec
+
+# Optional accelerators, probed without importing them so a cold start does
+# not pay for them: FAISS (indexed search, falls back to a NumPy scan) and
+# Numba (speeds up that scan on large corpora)
+FAISS_AVAILABLE = find_spec("faiss") is not None
+NUMBA_AVAILABLE = find_spec("numba") is not None
 
 # Page config
 st.set_page_config(
@@ -47,13 +56,57 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Embedding model shared by sample data and text queries
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+
+# Corpus size at which search switches from exact to HNSW indexing
+HNSW_MIN_VECTORS = 10000
+
+# HNSW candidate list size at query time; FAISS defaults to 16, which misses
+# true nearest neighbours, so keep it well above the largest top_k (10)
+HNSW_SEARCH_EF = max(64, 4 * 10)
+
+# Corpus size from which the NumPy fallback uses the Numba kernel
+NUMBA_MIN_VECTORS = 10000
+
+# Persisted corpus: the vector matrix plus its metadata table
+CORPUS_DIR = Path(__file__).parent / "playground_corpus"
+CORPUS_MATRIX_PATH = CORPUS_DIR / "corpus.npy"
+CORPUS_META_PATH = CORPUS_DIR / "corpus_meta.parquet"
+
 # Initialize session state
-if 'vectors' not in st.session_state:
-    st.session_state.vectors = {}
+# Vectors are stored as one (N, EMBEDDING_DIM) float32 matrix plus a parallel list of ids
+if 'vector_matrix' not in st.session_state:
+    st.session_state.vector_matrix = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+if 'vector_ids' not in st.session_state:
+    st.session_state.vector_ids = []
 if 'metadata' not in st.session_state:
     st.session_state.metadata = {}
+if 'matrix_hash' not in st.session_state:
+    st.session_state.matrix_hash = None
+if 'metadata_df' not in st.session_state:
+    st.session_state.metadata_df = None
 if 'queries' not in st.session_state:
     st.session_state.queries = []
+if 'corpus_restored' not in st.session_state:
+    st.session_state.corpus_restored = False
+
+@st.cache_resource(show_spinner="Loading embedding model...")
+def get_embedder():
+    """Load the sentence-transformers model once per process."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+def embed_texts(texts):
+    """Embed texts as unit-norm float32 vectors in a single batched call."""
+    embeddings = get_embedder().encode(
+        texts,
+        batch_size=32,
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    )
+    return embeddings.astype(np.float32, copy=False)
 
 def generate_sample_data():
     """Generate sample vector data for demonstration."""
@@ -70,62 +123,227 @@ def generate_sample_data():
         "Embeddings convert text to numerical representations"
     ]
     
-    # Generate random vectors (simulating embeddings)
-    np.random.seed(42)
-    vectors = {}
-    metadata = {}
+    # Embed all sample texts in one batch
+    M = embed_texts(sample_texts)
     
-    for i, text in enumerate(sample_texts):
-        vector_id = f"doc_{i}"
-        # Generate 128-dimensional vector
-        vector = np.random.randn(128)
-        vector = vector / np.linalg.norm(vector)  # Normalize
-        
-        vectors[vector_id] = vector
-        metadata[vector_id] = {
+    vector_ids = [f"doc_{i}" for i in range(len(sample_texts))]
+    categories = ['AI/ML', 'NLP', 'Computer Vision', 'Learning']
+    created_at = datetime.now().isoformat()
+    metadata = {
+        vector_id: {
             'text': text,
-            'category': ['AI/ML', 'NLP', 'Computer Vision', 'Learning'][i % 4],
-            'created_at': datetime.now().isoformat(),
-            'vector_dim': 128
+            'category': categories[i % 4],
+            'created_at': created_at,
+            'vector_dim': EMBEDDING_DIM
         }
+        for i, (vector_id, text) in enumerate(zip(vector_ids, sample_texts))
+    }
+    
+    return vector_ids, M, metadata
+
+def _replace_file(path, write):
+    """Write a file via a temp file in the same directory, then swap it in.
+    
+    Other sessions may hold the old file memory-mapped; rewriting it in place
+    could fault their reads, while ``os.replace`` leaves their mapping intact.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=path.suffix + '.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+def save_corpus(vector_ids, matrix, metadata):
+    """Persist the corpus so later sessions can skip re-embedding."""
+    CORPUS_DIR.mkdir(parents=True, exist_ok=True)
+    _replace_file(CORPUS_MATRIX_PATH, lambda f: np.save(f, matrix))
+    meta_df = pd.DataFrame([{'id': i, **metadata[i]} for i in vector_ids])
+    _replace_file(CORPUS_META_PATH, lambda f: meta_df.to_parquet(f, index=False))
+
+def load_corpus():
+    """Memory-map the persisted corpus, or return None if none is saved."""
+    if not (CORPUS_MATRIX_PATH.exists() and CORPUS_META_PATH.exists()):
+        return None
     
-    return vectors, metadata
+    matrix = np.load(CORPUS_MATRIX_PATH, mmap_mode='r')
+    meta_df = pd.read_parquet(CORPUS_META_PATH)
+    vector_ids = meta_df['id'].tolist()
+    if len(vector_ids) != len(matrix):
+        # Caught between the two file swaps of a concurrent save
+        return None
+    metadata = meta_df.set_index('id').to_dict(orient='index')
+    return vector_ids, matrix, metadata
 
-def calculate_similarity(vec1, vec2):
-    """Calculate cosine similarity between two vectors."""
-    return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+def delete_corpus():
+    """Remove the persisted corpus files."""
+    CORPUS_MATRIX_PATH.unlink(missing_ok=True)
+    CORPUS_META_PATH.unlink(missing_ok=True)
 
-def search_similar_vectors(query_vector, vectors, top_k=5):
-    """Search for most similar vectors."""
-    similarities = []
-    
-    for doc_id, vector in vectors.items():
-        similarity = calculate_similarity(query_vector, vector)
-        similarities.append({
-            'doc_id': doc_id,
-            'similarity': similarity,
-            'vector': vector
-        })
-    
-    # Sort by similarity (descending)
-    similarities.sort(key=lambda x: x['similarity'], reverse=True)
-    return similarities[:top_k]
+def set_corpus(vector_ids, matrix, metadata):
+    """Install a corpus in session state along with its derived caches."""
+    st.session_state.vector_ids = vector_ids
+    st.session_state.vector_matrix = matrix
+    st.session_state.metadata = metadata
+    st.session_state.matrix_hash = array_fingerprint(matrix)
+    st.session_state.metadata_df = build_metadata_frame(vector_ids, metadata)
+
+def build_metadata_frame(vector_ids, metadata):
+    """Build the Data Browser table column by column from the metadata dict."""
+    return pd.DataFrame({
+        'ID': vector_ids,
+        'Text': [metadata[i]['text'] for i in vector_ids],
+        'Category': pd.Categorical([metadata[i]['category'] for i in vector_ids]),
+        'Vector Dim': np.array([metadata[i]['vector_dim'] for i in vector_ids], dtype=np.int16),
+        'Created': pd.to_datetime([metadata[i]['created_at'] for i in vector_ids])
+    })
 
-def visualize_vectors_2d(vectors, metadata, selected_ids=None):
-    """Create 2D visualization of vectors using t-SNE."""
-    if not vectors:
+@st.cache_resource(show_spinner=False)
+def get_faiss_index(matrix_hash, _matrix):
+    """Build a FAISS inner-product index over the vector matrix, cached per corpus.
+    
+    Exact ``IndexFlatIP`` for small corpora, ``IndexHNSWFlat`` once the corpus
+    reaches ``HNSW_MIN_VECTORS``. Returns None when FAISS is not installed.
+    """
+    if not FAISS_AVAILABLE or len(_matrix) == 0:
         return None
     
-    # Prepare data for t-SNE
-    vector_list = list(vectors.values())
-    doc_ids = list(vectors.keys())
+    import faiss
+    d = _matrix.shape[1]
+    if len(_matrix) >= HNSW_MIN_VECTORS:
+        index = faiss.IndexHNSWFlat(d, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = HNSW_SEARCH_EF
+    else:
+        index = faiss.IndexFlatIP(d)
+    index.add(np.ascontiguousarray(_matrix, dtype=np.float32))
+    return index
+
+@lru_cache(maxsize=1)
+def _get_dot_scores():
+    """Import Numba and build the scoring kernel on first use."""
+    import numba
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _dot_scores(matrix, query):
+        """Dot product of every row with the query, parallel over rows."""
+        n, d = matrix.shape
+        sims = np.empty(n, dtype=np.float32)
+        for i in numba.prange(n):
+            s = np.float32(0.0)
+            for j in range(d):
+                s += matrix[i, j] * query[j]
+            sims[i] = s
+        return sims
+    
+    return _dot_scores
+
+def search_similar_vectors(query_vector, matrix, vector_ids, top_k=5, similarity_threshold=None, index=None):
+    """Search for most similar vectors.
+    
+    ``matrix`` holds one L2-normalized vector per row and ``query_vector`` is
+    expected to be unit-norm too, so cosine similarity against every stored
+    vector is a single matrix-vector product.
+    """
+    if len(vector_ids) == 0:
+        return []
+    
+    if index is not None:
+        q = query_vector.astype(np.float32).reshape(1, -1)
+        D, I = index.search(q, min(top_k, len(vector_ids)))
+        return [
+            {
+                'doc_id': vector_ids[i],
+                'similarity': float(score),
+                'vector': matrix[i]
+            }
+            for score, i in zip(D[0], I[0])
+            if i != -1 and (similarity_threshold is None or score >= similarity_threshold)
+        ]
+    
+    query = query_vector.astype(np.float32, copy=False)
+    if NUMBA_AVAILABLE and len(vector_ids) >= NUMBA_MIN_VECTORS:
+        sims = _get_dot_scores()(np.asarray(matrix, dtype=np.float32), np.ascontiguousarray(query))
+    else:
+        sims = matrix @ query
+    return rank_similarities(sims, matrix, vector_ids, top_k, similarity_threshold)
+
+def rank_similarities(sims, matrix, vector_ids, top_k=5, similarity_threshold=None):
+    """Turn a vector of similarity scores into the top-k result dicts."""
+    # Keep only candidates above the threshold
+    if similarity_threshold is None:
+        candidates = np.where(sims > -np.inf)[0]
+    else:
+        candidates = np.where(sims >= similarity_threshold)[0]
+    
+    # Partial selection of the top k, then sort only those
+    if len(candidates) > top_k:
+        part = np.argpartition(-sims[candidates], top_k)[:top_k]
+        candidates = candidates[part]
+    top_idx = candidates[np.argsort(-sims[candidates])]
     
-    # Convert list to numpy array
-    vector_array = np.array(vector_list)
+    return [
+        {
+            'doc_id': vector_ids[i],
+            'similarity': float(sims[i]),
+            'vector': matrix[i]
+        }
+        for i in top_idx
+    ]
+
+def search_existing_vector(doc_index, matrix, vector_ids, top_k=5, similarity_threshold=None):
+    """Find the neighbours of a stored vector, excluding the vector itself."""
+    # One matrix-vector product is cheaper than fetching a cached all-pairs row
+    sims = matrix @ matrix[doc_index]
     
-    # Apply t-SNE for dimensionality reduction
-    tsne = TSNE(n_components=2, random_state=42, perplexity=min(5, len(vector_list)-1))
-    vectors_2d = tsne.fit_transform(vector_array)
+    # Self-similarity is always 1.0, so leave it out of the ranking
+    sims[doc_index] = -np.inf
+    return rank_similarities(sims, matrix, vector_ids, top_k, similarity_threshold)
+
+def array_fingerprint(array):
+    """Content hash of an array, used as a cache key."""
+    return hashlib.blake2b(array.tobytes(), digest_size=8).hexdigest()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_search(matrix_hash, query_hash, top_k, similarity_threshold, _query_vector, _matrix, _vector_ids):
+    """Search memoized on (corpus, query, top_k, threshold) fingerprints.
+    
+    Nudging a slider back to a previous value reuses the earlier results, and
+    loading or clearing data changes ``matrix_hash`` so stale entries are
+    never hit.
+    """
+    return search_similar_vectors(
+        _query_vector,
+        _matrix,
+        _vector_ids,
+        top_k,
+        similarity_threshold,
+        index=get_faiss_index(matrix_hash, _matrix)
+    )
+
+@st.cache_data(show_spinner=False)
+def project_2d(matrix_hash, _matrix, use_tsne=False):
+    """Project the vector matrix to 2D with PCA, or t-SNE if requested.
+    
+    Cached on ``matrix_hash``; the matrix itself is not hashed.
+    """
+    if use_tsne:
+        from sklearn.manifold import TSNE
+        tsne = TSNE(n_components=2, random_state=42, perplexity=min(5, len(_matrix) - 1))
+        return tsne.fit_transform(_matrix)
+    
+    from sklearn.decomposition import PCA
+    pca = PCA(n_components=2, svd_solver='randomized', random_state=42)
+    return pca.fit_transform(_matrix)
+
+def visualize_vectors_2d(matrix, doc_ids, metadata, matrix_hash, selected_ids=None, use_tsne=False):
+    """Create 2D visualization of vectors using PCA (or t-SNE)."""
+    if len(doc_ids) == 0:
+        return None
+    
+    vectors_2d = project_2d(matrix_hash, matrix, use_tsne=use_tsne)
     
     # Create DataFrame for plotting
     df = pd.DataFrame({
@@ -144,26 +362,67 @@ def visualize_vectors_2d(vectors, metadata, selected_ids=None):
     
     return df
 
+@st.cache_data(show_spinner=False)
+def build_vector_figure(matrix_hash, selected_ids, use_tsne, _matrix, _doc_ids, _metadata):
+    """Build the 2D scatter figure, cached per corpus, selection and projection method."""
+    df = visualize_vectors_2d(_matrix, _doc_ids, _metadata, matrix_hash, selected_ids, use_tsne)
+    method = "t-SNE" if use_tsne else "PCA"
+    
+    # Color by category
+    fig = px.scatter(
+        df, x='x', y='y', 
+        color='category',
+        hover_data=['text'],
+        title=f"2D Vector Space Visualization ({method})",
+        labels={'x': f'{method} 1', 'y': f'{method} 2'}
+    )
+    
+    # Highlight selected points
+    if selected_ids:
+        import plotly.graph_objects as go
+        selected_df = df[df['selected']]
+        fig.add_trace(go.Scatter(
+            x=selected_df['x'],
+            y=selected_df['y'],
+            mode='markers',
+            marker=dict(size=15, color='red', symbol='star'),
+            name='Search Results',
+            showlegend=True
+        ))
+    
+    return fig, df
+
 def main():
     st.markdown('<h1 class="main-header">🧠 Vector Database Playground</h1>', unsafe_allow_html=True)
     
+    # Restore a previously saved corpus once per session
+    if not st.session_state.corpus_restored:
+        st.session_state.corpus_restored = True
+        corpus = load_corpus()
+        if corpus is not None:
+            set_corpus(*corpus)
+    
     # Sidebar
     with st.sidebar:
         st.markdown("### 🎛️ Controls")
         
         # Load sample data
         if st.button("📊 Load Sample Data"):
-            with st.spinner("Generating sample vectors..."):
-                vectors, metadata = generate_sample_data()
-                st.session_state.vectors = vectors
-                st.session_state.metadata = metadata
-                st.success(f"Loaded {len(vectors)} sample vectors!")
+            with st.spinner("Embedding sample texts..."):
+                vector_ids, matrix, metadata = generate_sample_data()
+                set_corpus(vector_ids, matrix, metadata)
+                save_corpus(vector_ids, matrix, metadata)
+                st.success(f"Loaded {len(vector_ids)} sample vectors!")
         
         # Clear data
         if st.button("🗑️ Clear Data"):
-            st.session_state.vectors = {}
+            st.session_state.vector_ids = []
+            st.session_state.vector_matrix = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
             st.session_state.metadata = {}
+            st.session_state.matrix_hash = None
+            st.session_state.metadata_df = None
             st.session_state.queries = []
+            delete_corpus()
             st.success("Data cleared!")
         
         st.markdown("---")
@@ -176,16 +435,14 @@ def main():
         st.markdown("---")
         
         # Statistics
-        if st.session_state.vectors:
+        if st.session_state.vector_ids:
             st.markdown("### 📊 Statistics")
-            st.metric("Total Vectors", len(st.session_state.vectors))
-            if st.session_state.vectors:
-                sample_vector = list(st.session_state.vectors.values())[0]
-                st.metric("Vector Dimensions", len(sample_vector))
+            st.metric("Total Vectors", len(st.session_state.vector_ids))
+            st.metric("Vector Dimensions", st.session_state.vector_matrix.shape[1])
             st.metric("Categories", len(set([m.get('category', 'Unknown') for m in st.session_state.metadata.values()])))
     
     # Main content
-    if not st.session_state.vectors:
+    if not st.session_state.vector_ids:
         st.info("👆 Click 'Load Sample Data' in the sidebar to get started!")
         return
     
@@ -206,27 +463,26 @@ def main():
             
             if search_method == "Random Query Vector":
                 if st.button("🎲 Generate Random Query"):
-                    query_vector = np.random.randn(128)
-                    query_vector = query_vector / np.linalg.norm(query_vector)
+                    query_vector = np.random.randn(EMBEDDING_DIM).astype(np.float32)
+                    query_vector /= np.linalg.norm(query_vector)
                     st.session_state.current_query = query_vector
                     st.session_state.query_type = "random"
             
             elif search_method == "Text-based Query":
                 query_text = st.text_input("Enter your query:")
                 if st.button("🔍 Search"):
-                    # Simulate text-to-vector conversion
-                    np.random.seed(hash(query_text) % 2**32)
-                    query_vector = np.random.randn(128)
-                    query_vector = query_vector / np.linalg.norm(query_vector)
+                    query_vector = embed_texts([query_text])[0]
                     st.session_state.current_query = query_vector
                     st.session_state.query_type = "text"
                     st.session_state.query_text = query_text
             
             elif search_method == "Select Existing Vector":
-                doc_id = st.selectbox("Select document:", list(st.session_state.vectors.keys()))
+                doc_id = st.selectbox("Select document:", st.session_state.vector_ids)
                 if st.button("🔍 Search Similar"):
-                    query_vector = st.session_state.vectors[doc_id]
+                    doc_index = st.session_state.vector_ids.index(doc_id)
+                    query_vector = st.session_state.vector_matrix[doc_index]
                     st.session_state.current_query = query_vector
+                    st.session_state.query_index = doc_index
                     st.session_state.query_type = "existing"
                     st.session_state.query_text = f"Similar to: {st.session_state.metadata[doc_id]['text'][:50]}..."
         
@@ -243,15 +499,25 @@ def main():
             st.markdown("---")
             st.markdown("### 🎯 Search Results")
             
-            # Search
-            results = search_similar_vectors(
-                st.session_state.current_query, 
-                st.session_state.vectors, 
-                top_k
-            )
-            
-            # Filter by threshold
-            filtered_results = [r for r in results if r['similarity'] >= similarity_threshold]
+            # Search, keeping only results above the threshold
+            if st.session_state.query_type == "existing":
+                filtered_results = search_existing_vector(
+                    st.session_state.query_index,
+                    st.session_state.vector_matrix,
+                    st.session_state.vector_ids,
+                    top_k,
+                    similarity_threshold
+                )
+            else:
+                filtered_results = cached_search(
+                    st.session_state.matrix_hash,
+                    array_fingerprint(st.session_state.current_query),
+                    top_k,
+                    similarity_threshold,
+                    st.session_state.current_query,
+                    st.session_state.vector_matrix,
+                    st.session_state.vector_ids
+                )
             
             if filtered_results:
                 # Display results
@@ -287,36 +553,21 @@ def main():
     with tab2:
         st.markdown("### 📊 Vector Visualization")
         
-        if st.session_state.vectors:
+        if st.session_state.vector_ids:
+            use_tsne = st.checkbox("Use t-SNE (slow)")
+            selected_ids = tuple(r['doc_id'] for r in filtered_results) if 'filtered_results' in locals() else ()
+            
             # Create 2D visualization
-            df = visualize_vectors_2d(
-                st.session_state.vectors, 
-                st.session_state.metadata,
-                selected_ids=[r['doc_id'] for r in filtered_results] if 'filtered_results' in locals() else None
+            fig, df = build_vector_figure(
+                st.session_state.matrix_hash,
+                selected_ids,
+                use_tsne,
+                st.session_state.vector_matrix,
+                st.session_state.vector_ids,
+                st.session_state.metadata
             )
             
             if df is not None:
-                # Color by category
-                fig = px.scatter(
-                    df, x='x', y='y', 
-                    color='category',
-                    hover_data=['text'],
-                    title="2D Vector Space Visualization (t-SNE)",
-                    labels={'x': 't-SNE 1', 'y': 't-SNE 2'}
-                )
-                
-                # Highlight selected points
-                if 'filtered_results' in locals() and filtered_results:
-                    selected_df = df[df['doc_id'].isin([r['doc_id'] for r in filtered_results])]
-                    fig.add_trace(go.Scatter(
-                        x=selected_df['x'],
-                        y=selected_df['y'],
-                        mode='markers',
-                        marker=dict(size=15, color='red', symbol='star'),
-                        name='Search Results',
-                        showlegend=True
-                    ))
-                
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Vector statistics
@@ -331,19 +582,9 @@ def main():
     with tab3:
         st.markdown("### 📋 Data Browser")
         
-        if st.session_state.vectors:
-            # Create DataFrame for display
-            data = []
-            for doc_id, metadata in st.session_state.metadata.items():
-                data.append({
-                    'ID': doc_id,
-                    'Text': metadata['text'],
-                    'Category': metadata['category'],
-                    'Vector Dim': metadata['vector_dim'],
-                    'Created': metadata['created_at'][:19]
-                })
-            
-            df = pd.DataFrame(data)
+        if st.session_state.vector_ids:
+            # DataFrame built once when the data was loaded
+            df = st.session_state.metadata_df
             st.dataframe(df, use_container_width=True)
             
             # Category distribution
@@ -6,16 +6,30 @@ Vector Database Playground with ChromaDB Backend
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.manifold import TSNE
-from sklearn.metrics.pairwise import cosine_similarity
 import json
 import time
+import hashlib
+import uuid
+import atexit
+import threading
+from collections import deque
+from itertools import islice
 from datetime import datetime
 import chromadb
 from chromadb.config import Settings
 import os
+from functools import lru_cache
+from importlib.util import find_spec
+from chromadb_settings import (
+    EMBEDDING_MODEL, EMBEDDING_DIM, MAX_TOP_K, COLLECTION_METADATA, COLLECTION_NAME
+)
+
+# Optional accelerators, probed without importing them so a cold start does
+# not pay for packages the current view never uses:
+# openTSNE (FFT t-SNE), tsnecuda (GPU t-SNE) and Numba (exact-scan kernel)
+OPENTSNE_AVAILABLE = find_spec("openTSNE") is not None
+HAVE_CUDA_TSNE = find_spec("tsnecuda") is not None
+NUMBA_AVAILABLE = find_spec("numba") is not None
 
 # Page config
 st.set_page_config(
@@ -65,6 +79,31 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Default number of results shown by the search tab
+DEFAULT_TOP_K = 5
+
+# Number of vectors sent per collection.add call
+ADD_BATCH_SIZE = 200
+
+# Below this many vectors an exact scan of the cached matrix beats HNSW
+BRUTEFORCE_MAX_VECTORS = 50_000
+
+# Rows upcast to float32 at a time when scoring the float16 matrix
+SCORE_CHUNK_ROWS = 4096
+
+# Collections at least this large score with the Numba kernel when available
+NUMBA_MIN_VECTORS = 10000
+
+# Collections larger than this use the GPU t-SNE when tsnecuda is installed
+CUDA_TSNE_MIN_VECTORS = 2000
+
+# Query history: entries kept in the session, entries rendered, and the
+# batch size used when archiving evicted entries to ChromaDB
+QUERY_HISTORY_SIZE = 200
+QUERY_HISTORY_RENDER = 25
+HISTORY_FLUSH_BATCH = 100
+HISTORY_COLLECTION_NAME = "query_history"
+
 # Initialize ChromaDB
 def init_chromadb():
     """Initialize ChromaDB client."""
@@ -82,8 +121,8 @@ def init_chromadb():
         
         # Get or create collection
         collection = client.get_or_create_collection(
-            name="playground_vectors",
-            metadata={"hnsw:space": "cosine"}
+            name=COLLECTION_NAME,
+            metadata=COLLECTION_METADATA
         )
         
         return client, collection
@@ -95,7 +134,16 @@ def init_chromadb():
 if 'chromadb_client' not in st.session_state:
     st.session_state.chromadb_client, st.session_state.chromadb_collection = init_chromadb()
 if 'queries' not in st.session_state:
-    st.session_state.queries = []
+    # Newest first; the oldest entry is evicted from the right
+    st.session_state.queries = deque(maxlen=QUERY_HISTORY_SIZE)
+if 'pending_queries' not in st.session_state:
+    st.session_state.pending_queries = []
+
+@st.cache_resource(show_spinner=False)
+def get_encoder():
+    """Load the sentence-transformers model once per process."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
 
 def generate_sample_data():
     """Generate sample vector data and store in ChromaDB."""
@@ -117,69 +165,186 @@ def generate_sample_data():
         return False
     
     try:
-        # Generate random vectors (simulating embeddings)
-        np.random.seed(42)
-        vectors = []
-        ids = []
-        metadatas = []
+        # Embed all sample texts as unit vectors in one batched call
+        V = get_encoder().encode(
+            sample_texts,
+            batch_size=32,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ).astype(np.float32)
         
-        for i, text in enumerate(sample_texts):
-            vector_id = f"doc_{i}"
-            # Generate 128-dimensional vector
-            vector = np.random.randn(128)
-            vector = vector / np.linalg.norm(vector)  # Normalize
-            
-            vectors.append(vector.tolist())
-            ids.append(vector_id)
-            metadatas.append({
+        ids = [f"doc_{i}" for i in range(len(sample_texts))]
+        categories = ['AI/ML', 'NLP', 'Computer Vision', 'Learning']
+        created_at = datetime.now().isoformat()
+        metadatas = [
+            {
                 'text': text,
-                'category': ['AI/ML', 'NLP', 'Computer Vision', 'Learning'][i % 4],
-                'created_at': datetime.now().isoformat(),
-                'vector_dim': 128
-            })
+                'category': categories[i % 4],
+                'created_at': created_at,
+                'vector_dim': EMBEDDING_DIM
+            }
+            for i, text in enumerate(sample_texts)
+        ]
         
-        # Add to ChromaDB
-        st.session_state.chromadb_collection.add(
-            embeddings=vectors,
-            ids=ids,
-            metadatas=metadatas
-        )
+        # A store built with another embedding size cannot take these vectors
+        _ensure_embedding_dim()
         
+        # Add to ChromaDB in batches
+        try:
+            _add_batches(V, ids, metadatas)
+        except Exception as e:
+            # An emptied collection keeps the dimension of its first vectors
+            if 'dimension' not in str(e).lower():
+                raise
+            _recreate_collection()
+            _add_batches(V, ids, metadatas)
+        
+        bump_data_version()
         return True
     except Exception as e:
         st.error(f"Error generating sample data: {str(e)}")
         return False
 
-def get_all_vectors():
-    """Get all vectors from ChromaDB."""
+def _add_batches(V, ids, metadatas):
+    """Add vectors to the collection in ADD_BATCH_SIZE chunks."""
+    for start in range(0, len(ids), ADD_BATCH_SIZE):
+        end = start + ADD_BATCH_SIZE
+        st.session_state.chromadb_collection.add(
+            embeddings=V[start:end].tolist(),
+            ids=ids[start:end],
+            metadatas=metadatas[start:end]
+        )
+
+def _stored_dimension():
+    """Dimension of the vectors in the collection, or None if it is empty."""
+    results = st.session_state.chromadb_collection.get(limit=1, include=["embeddings"])
+    embeddings = results.get('embeddings')
+    if embeddings is None or len(embeddings) == 0:
+        return None
+    return len(embeddings[0])
+
+def _recreate_collection():
+    """Drop and recreate the collection with the playground's settings."""
+    st.session_state.chromadb_client.delete_collection(COLLECTION_NAME)
+    st.session_state.chromadb_collection = st.session_state.chromadb_client.get_or_create_collection(
+        name=COLLECTION_NAME,
+        metadata=COLLECTION_METADATA
+    )
+
+def _ensure_embedding_dim():
+    """Recreate the collection if it holds vectors of another dimension.
+    
+    Returns True when the collection was replaced.
+    """
+    stored = _stored_dimension()
+    if stored is not None and stored != EMBEDDING_DIM:
+        _recreate_collection()
+        return True
+    return False
+
+@st.cache_data(ttl=5, show_spinner=False)
+def cached_count(collection_name, version, _collection):
+    """Number of vectors in the collection.
+    
+    ``version`` is the process-wide data version, bumped whenever any session
+    changes the data. ``_collection`` is excluded from the cache key by its
+    leading underscore.
+    """
+    return _collection.count()
+
+@st.cache_resource
+def _data_state():
+    """Data version shared by every session in this process."""
+    return {'version': 0, 'lock': threading.Lock()}
+
+def collection_count():
+    """Cached vector count of the playground collection."""
     if not st.session_state.chromadb_collection:
-        return {}, {}
+        return 0
+    return cached_count(COLLECTION_NAME, _data_state()['version'], st.session_state.chromadb_collection)
+
+def bump_data_version():
+    """Invalidate cached reads of the collection after an insert or clear."""
+    state = _data_state()
+    with state['lock']:
+        state['version'] += 1
+    get_all_vectors.clear()
+
+@st.cache_data(show_spinner=False)
+def get_all_vectors(count, collection_name):
+    """Get all vectors from ChromaDB as ``(ids, X, texts, categories, created_at)``.
+    
+    ``X`` is a contiguous float16 array of shape (N, EMBEDDING_DIM); unit-norm
+    embeddings lose little precision at half width and every pass over them
+    moves half the bytes. The metadata columns are pulled out once here so
+    render code only has to build DataFrames from them. Rows of every column
+    line up with ``ids``. Cached on the collection's name and row count, so
+    reruns that don't change the data skip the database entirely.
+    """
+    empty = (
+        [],
+        np.empty((0, EMBEDDING_DIM), dtype=np.float16),
+        [],
+        np.empty(0, dtype=object),
+        []
+    )
+    if not st.session_state.chromadb_collection or count == 0:
+        return empty
     
     try:
-        # Check if collection has any data
-        count = st.session_state.chromadb_collection.count()
-        if count == 0:
-            return {}, {}
-        
-        results = st.session_state.chromadb_collection.get()
+        results = st.session_state.chromadb_collection.get(include=["embeddings", "metadatas"])
         
         # Check if results are valid
         if not results or 'ids' not in results or not results['ids']:
-            return {}, {}
+            return empty
         
-        vectors = {}
-        metadata = {}
+        ids = list(results['ids'])
+        X = np.asarray(results['embeddings'], dtype=np.float16)
         
-        for i, doc_id in enumerate(results['ids']):
-            # Convert embedding back to numpy array
-            vector = np.array(results['embeddings'][i])
-            vectors[doc_id] = vector
-            metadata[doc_id] = results['metadatas'][i]
+        metadatas = [m or {} for m in results['metadatas']]
+        texts = [m.get('text', '') for m in metadatas]
+        categories = np.array([m.get('category', 'Unknown') for m in metadatas], dtype=object)
+        created_at = [m.get('created_at', '') for m in metadatas]
         
-        return vectors, metadata
+        return ids, X, texts, categories, created_at
     except Exception as e:
         st.error(f"Error getting vectors: {str(e)}")
-        return {}, {}
+        return empty
+
+@lru_cache(maxsize=1)
+def _get_dot_scores():
+    """Import Numba and build the scoring kernel on first use."""
+    import numba
+    
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _dot_scores(X, q):
+        """Dot product of every row with the query, parallel over rows."""
+        n, d = X.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in numba.prange(n):
+            s = np.float32(0.0)
+            for j in range(d):
+                s += X[i, j] * q[j]
+            scores[i] = s
+        return scores
+    
+    return _dot_scores
+
+def _bruteforce_topk(X, q, k):
+    """Exact top-k by inner product; returns row indices and scores, best first."""
+    dot_scores = _get_dot_scores() if NUMBA_AVAILABLE and len(X) >= NUMBA_MIN_VECTORS else None
+    q = np.ascontiguousarray(q, dtype=np.float32)
+    
+    # Upcast the float16 matrix a block at a time so each block stays in cache
+    scores = np.empty(len(X), dtype=np.float32)
+    for start in range(0, len(X), SCORE_CHUNK_ROWS):
+        end = start + SCORE_CHUNK_ROWS
+        block = X[start:end].astype(np.float32)
+        scores[start:end] = dot_scores(block, q) if dot_scores else block @ q
+    k = min(k, len(scores))
+    idx = np.argpartition(-scores, k - 1)[:k]
+    order = idx[np.argsort(-scores[idx])]
+    return order, scores[order]
 
 def search_similar_vectors(query_vector, top_k=5):
     """Search for most similar vectors using ChromaDB."""
@@ -188,72 +353,217 @@ def search_similar_vectors(query_vector, top_k=5):
     
     try:
         # Check if collection has any data
-        count = st.session_state.chromadb_collection.count()
+        count = collection_count()
         if count == 0:
             st.warning("No vectors in database. Please load sample data first.")
             return []
         
+        # Small collections: score the cached unit-norm matrix directly
+        if count < BRUTEFORCE_MAX_VECTORS:
+            ids, X, texts, categories, created_at = get_all_vectors(count, COLLECTION_NAME)
+            if ids:
+                q = np.asarray(query_vector, dtype=np.float32)
+                order, scores = _bruteforce_topk(X, q, top_k)
+                return [
+                    {
+                        'doc_id': ids[i],
+                        'similarity': float(score),
+                        'metadata': {
+                            'text': texts[i],
+                            'category': categories[i],
+                            'created_at': created_at[i]
+                        }
+                    }
+                    for i, score in zip(order, scores)
+                ]
+        
         results = st.session_state.chromadb_collection.query(
             query_embeddings=[query_vector.tolist()],
             n_results=min(top_k, count),  # Don't ask for more than available
-            include=["embeddings", "metadatas", "distances"]
+            include=["metadatas", "distances"]
         )
         
-        similarities = []
         if results and 'ids' in results and results['ids'] and results['ids'][0]:
-            for i, doc_id in enumerate(results['ids'][0]):
-                similarity = 1 - results['distances'][0][i]  # Convert distance to similarity
-                similarities.append({
-                    'doc_id': doc_id,
-                    'similarity': similarity,
-                    'metadata': results['metadatas'][0][i]
-                })
-        
-        return similarities
+            return _to_similarities(results, 0)
+        return []
     except Exception as e:
         st.error(f"Error searching vectors: {str(e)}")
         return []
 
+def _to_similarities(results, row):
+    """Convert one row of a collection.query result into similarity dicts."""
+    return [
+        {
+            'doc_id': doc_id,
+            'similarity': 1 - distance,  # Convert distance to similarity
+            'metadata': doc_metadata
+        }
+        for doc_id, distance, doc_metadata in zip(
+            results['ids'][row], results['distances'][row], results['metadatas'][row]
+        )
+    ]
+
+@st.cache_resource
+def _history_backlog():
+    """Evicted history entries waiting to be archived, shared by every session.
+    
+    Entries still pending when the server exits are written by an atexit
+    hook, so they outlive the session that evicted them.
+    """
+    backlog = {'rows': [], 'lock': threading.Lock(), 'client': None}
+    atexit.register(_archive_backlog, backlog)
+    return backlog
+
+def _archive_backlog(backlog):
+    """Write pending entries to the query_history collection in batches."""
+    with backlog['lock']:
+        rows = backlog['rows']
+        if not rows or backlog['client'] is None:
+            return
+        
+        collection = backlog['client'].get_or_create_collection(name=HISTORY_COLLECTION_NAME)
+        while rows:
+            batch = rows[:HISTORY_FLUSH_BATCH]
+            collection.add(
+                ids=[uuid.uuid4().hex for _ in batch],
+                embeddings=np.vstack([q['query_vector'] for q in batch]).tolist(),
+                metadatas=[
+                    {
+                        'timestamp': q['timestamp'],
+                        'query_type': q['query_type'],
+                        'query_text': q['query_text'],
+                        'results_count': int(q['results_count']),
+                        'top_similarity': float(q['top_similarity'])
+                    }
+                    for q in batch
+                ]
+            )
+            # Drop only what was written, so a failed add is retried later
+            del rows[:len(batch)]
+
+def record_query(query_info):
+    """Add a query to the session history, archiving the entry it evicts."""
+    queries = st.session_state.queries
+    if len(queries) == queries.maxlen:
+        backlog = _history_backlog()
+        with backlog['lock']:
+            backlog['rows'].append(queries.pop())
+            backlog['client'] = backlog['client'] or st.session_state.chromadb_client
+            pending = len(backlog['rows'])
+        if pending >= HISTORY_FLUSH_BATCH:
+            flush_history()
+    queries.appendleft(query_info)
+
+def flush_history():
+    """Archive the evicted history entries now."""
+    try:
+        _archive_backlog(_history_backlog())
+    except Exception as e:
+        st.warning(f"Could not archive query history: {str(e)}")
+
+def queue_query(query_vector):
+    """Add a query vector to the batch run by the next flush_queries call."""
+    st.session_state.pending_queries.append(np.asarray(query_vector, dtype=np.float32))
+
+def flush_queries(top_k=DEFAULT_TOP_K):
+    """Run all pending queries in a single collection.query call.
+    
+    Returns one list of similarity dicts per pending query, in queue order.
+    """
+    pending = st.session_state.pending_queries
+    if not pending or not st.session_state.chromadb_collection:
+        return []
+    st.session_state.pending_queries = []
+    
+    try:
+        count = collection_count()
+        if count == 0:
+            return [[] for _ in pending]
+        
+        # One HNSW traversal for the whole batch, then split results by row
+        Q = np.vstack(pending)
+        results = st.session_state.chromadb_collection.query(
+            query_embeddings=Q.tolist(),
+            n_results=min(top_k, count),
+            include=["metadatas", "distances"]
+        )
+        return [_to_similarities(results, row) for row in range(len(pending))]
+    except Exception as e:
+        st.error(f"Error running batched queries: {str(e)}")
+        return []
+
 def clear_all_data():
-    """Clear all data from ChromaDB."""
+    """Clear all vectors from ChromaDB.
+    
+    The archived query history lives in its own collection and is kept.
+    """
     if not st.session_state.chromadb_collection:
         return False
     
     try:
-        # Reset the collection
-        st.session_state.chromadb_client.delete_collection("playground_vectors")
-        st.session_state.chromadb_collection = st.session_state.chromadb_client.create_collection(
-            name="playground_vectors",
-            metadata={"hnsw:space": "cosine"}
-        )
+        # Empty the collection in place so its HNSW index and settings are kept;
+        # a store with vectors of another dimension is recreated instead
+        if not _ensure_embedding_dim():
+            ids = st.session_state.chromadb_collection.get(include=[])['ids']
+            if ids:
+                st.session_state.chromadb_collection.delete(ids=ids)
+        bump_data_version()
         return True
     except Exception as e:
         st.error(f"Error clearing data: {str(e)}")
         return False
 
-def visualize_vectors_2d(vectors, metadata, selected_ids=None):
-    """Create 2D visualization of vectors using t-SNE."""
-    if not vectors:
-        return None
+def _fingerprint(X):
+    """Short content hash of a vector matrix, used as a cache key."""
+    return hashlib.blake2b(np.ascontiguousarray(X).tobytes(), digest_size=8).hexdigest()
+
+@st.cache_data(show_spinner="Projecting...")
+def _fit_tsne(shape, fingerprint, _X):
+    """Reduce vectors to 2D with t-SNE, cached on the matrix shape and contents.
     
-    # Prepare data for t-SNE
-    vector_list = list(vectors.values())
-    doc_ids = list(vectors.keys())
+    ``_X`` may be the cached float16 matrix; it is upcast here so reruns that
+    hit the cache never copy it.
+    """
+    n = shape[0]
+    _X = np.asarray(_X, dtype=np.float32)
     
-    # Convert list to numpy array
-    vector_array = np.array(vector_list)
+    if HAVE_CUDA_TSNE and n > CUDA_TSNE_MIN_VECTORS:
+        from tsnecuda import TSNE as CudaTSNE
+        return CudaTSNE(n_components=2, perplexity=30.0, learning_rate=200.0).fit_transform(_X)
+    
+    if OPENTSNE_AVAILABLE:
+        # FFT-interpolated gradients with multi-threaded neighbor search;
+        # perplexity is capped so the 3 * perplexity neighbors fit in the data
+        from openTSNE import TSNE as OpenTSNE
+        perplexity = min(30, max(5, n // 3), (n - 1) / 3)
+        embedding = OpenTSNE(
+            n_components=2,
+            n_jobs=-1,
+            negative_gradient_method="fft",
+            perplexity=perplexity,
+            random_state=42
+        ).fit(_X)
+        return np.asarray(embedding)
+    
+    from sklearn.manifold import TSNE
+    tsne = TSNE(n_components=2, random_state=42, perplexity=min(5, n-1))
+    return tsne.fit_transform(_X)
+
+def visualize_vectors_2d(doc_ids, vector_array, texts, categories, selected_ids=None):
+    """Create 2D visualization of vectors using t-SNE."""
+    if not doc_ids:
+        return None
     
-    # Apply t-SNE for dimensionality reduction
-    tsne = TSNE(n_components=2, random_state=42, perplexity=min(5, len(vector_list)-1))
-    vectors_2d = tsne.fit_transform(vector_array)
+    # Apply t-SNE for dimensionality reduction; reruns on unchanged data hit the cache
+    vectors_2d = _fit_tsne(vector_array.shape, _fingerprint(vector_array), vector_array)
     
     # Create DataFrame for plotting
     df = pd.DataFrame({
         'x': vectors_2d[:, 0],
         'y': vectors_2d[:, 1],
         'doc_id': doc_ids,
-        'text': [metadata.get(doc_id, {}).get('text', '')[:50] + '...' for doc_id in doc_ids],
-        'category': [metadata.get(doc_id, {}).get('category', 'Unknown') for doc_id in doc_ids]
+        'text': [text[:50] + '...' for text in texts],
+        'category': categories
     })
     
     # Add selection info
@@ -288,7 +598,7 @@ def main():
         # Clear data
         if st.button("🗑️ Clear All Data"):
             if clear_all_data():
-                st.success("All data cleared from ChromaDB!")
+                st.success("All data cleared from ChromaDB! Archived query history is kept.")
             else:
                 st.error("Failed to clear data")
         
@@ -296,7 +606,7 @@ def main():
         
         # Search parameters
         st.markdown("### 🔍 Search Parameters")
-        top_k = st.slider("Top K Results", 1, 10, 5)
+        top_k = st.slider("Top K Results", 1, MAX_TOP_K, DEFAULT_TOP_K)
         similarity_threshold = st.slider("Similarity Threshold", 0.0, 1.0, 0.5, 0.05)
         
         st.markdown("---")
@@ -304,7 +614,7 @@ def main():
         # Database info
         if st.session_state.chromadb_collection:
             try:
-                count = st.session_state.chromadb_collection.count()
+                count = collection_count()
                 st.markdown("### 📊 Database Info")
                 st.metric("Total Vectors", count)
                 st.metric("Database", "ChromaDB")
@@ -325,10 +635,11 @@ def main():
                 st.info("Try refreshing the page or check ChromaDB connection")
     
     # Get current data
-    vectors, metadata = get_all_vectors()
+    count = collection_count()
+    ids, X, texts, categories, created_at = get_all_vectors(count, COLLECTION_NAME)
     
     # Main content
-    if not vectors:
+    if not ids:
         st.info("👆 Click 'Load Sample Data' in the sidebar to get started!")
         return
     
@@ -340,6 +651,9 @@ def main():
         
         col1, col2 = st.columns([2, 1])
         
+        # Set when a search button fires, so reruns don't log the query again
+        new_query = False
+        
         with col1:
             # Search interface
             search_method = st.selectbox(
@@ -349,29 +663,33 @@ def main():
             
             if search_method == "Random Query Vector":
                 if st.button("🎲 Generate Random Query"):
-                    query_vector = np.random.randn(128)
-                    query_vector = query_vector / np.linalg.norm(query_vector)
+                    rng = np.random.default_rng()
+                    query_vector = rng.standard_normal(EMBEDDING_DIM, dtype=np.float32)
+                    query_vector /= np.linalg.norm(query_vector)
                     st.session_state.current_query = query_vector
                     st.session_state.query_type = "random"
+                    new_query = True
             
             elif search_method == "Text-based Query":
                 query_text = st.text_input("Enter your query:")
                 if st.button("🔍 Search"):
-                    # Simulate text-to-vector conversion
-                    np.random.seed(hash(query_text) % 2**32)
-                    query_vector = np.random.randn(128)
-                    query_vector = query_vector / np.linalg.norm(query_vector)
+                    query_vector = get_encoder().encode(
+                        [query_text], normalize_embeddings=True
+                    )[0].astype(np.float32)
                     st.session_state.current_query = query_vector
                     st.session_state.query_type = "text"
                     st.session_state.query_text = query_text
+                    new_query = True
             
             elif search_method == "Select Existing Vector":
-                doc_id = st.selectbox("Select document:", list(vectors.keys()))
+                doc_id = st.selectbox("Select document:", ids)
                 if st.button("🔍 Search Similar"):
-                    query_vector = vectors[doc_id]
+                    row = ids.index(doc_id)
+                    query_vector = X[row]
                     st.session_state.current_query = query_vector
                     st.session_state.query_type = "existing"
-                    st.session_state.query_text = f"Similar to: {metadata[doc_id]['text'][:50]}..."
+                    st.session_state.query_text = f"Similar to: {texts[row][:50]}..."
+                    new_query = True
         
         with col2:
             if 'current_query' in st.session_state:
@@ -393,31 +711,40 @@ def main():
             filtered_results = [r for r in results if r['similarity'] >= similarity_threshold]
             
             if filtered_results:
-                # Display results
-                for i, result in enumerate(filtered_results):
-                    doc_metadata = result['metadata']
-                    
-                    with st.expander(f"#{i+1} - {doc_metadata['text'][:50]}... (Similarity: {result['similarity']:.3f})"):
-                        col1, col2 = st.columns([3, 1])
-                        
-                        with col1:
-                            st.write(f"**Text:** {doc_metadata['text']}")
-                            st.write(f"**Category:** {doc_metadata['category']}")
-                            st.write(f"**Created:** {doc_metadata['created_at'][:19]}")
-                        
-                        with col2:
-                            st.metric("Similarity", f"{result['similarity']:.3f}")
-                            st.metric("Vector ID", result['doc_id'])
+                # Display results as one table
+                results_df = pd.DataFrame({
+                    'doc_id': [r['doc_id'] for r in filtered_results],
+                    'similarity': [r['similarity'] for r in filtered_results],
+                    'text': [r['metadata']['text'] for r in filtered_results],
+                    'category': [r['metadata']['category'] for r in filtered_results],
+                    'created': [r['metadata']['created_at'][:19] for r in filtered_results]
+                })
+                st.dataframe(
+                    results_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        'doc_id': "Vector ID",
+                        'similarity': st.column_config.ProgressColumn(
+                            "Similarity", format="%.3f", min_value=0.0, max_value=1.0
+                        ),
+                        'text': "Text",
+                        'category': "Category",
+                        'created': "Created",
+                    }
+                )
                 
-                # Store query
-                query_info = {
-                    'timestamp': datetime.now().isoformat(),
-                    'query_type': st.session_state.query_type,
-                    'query_text': getattr(st.session_state, 'query_text', 'Random vector'),
-                    'results_count': len(filtered_results),
-                    'top_similarity': filtered_results[0]['similarity'] if filtered_results else 0
-                }
-                st.session_state.queries.append(query_info)
+                # Store query, once per search rather than on every rerun
+                if new_query:
+                    query_info = {
+                        'timestamp': datetime.now().isoformat(),
+                        'query_type': st.session_state.query_type,
+                        'query_text': getattr(st.session_state, 'query_text', 'Random vector'),
+                        'results_count': len(filtered_results),
+                        'top_similarity': filtered_results[0]['similarity'] if filtered_results else 0,
+                        'query_vector': np.asarray(st.session_state.current_query, dtype=np.float32)
+                    }
+                    record_query(query_info)
                 
             else:
                 st.warning(f"No results found above similarity threshold {similarity_threshold}")
@@ -425,28 +752,34 @@ def main():
     with tab2:
         st.markdown("### 📊 Vector Visualization")
         
-        if vectors:
+        if ids:
             # Create 2D visualization
             df = visualize_vectors_2d(
-                vectors, 
-                metadata,
+                ids,
+                X,
+                texts,
+                categories,
                 selected_ids=[r['doc_id'] for r in filtered_results] if 'filtered_results' in locals() else None
             )
             
             if df is not None:
+                import plotly.express as px
+                
                 # Color by category
                 fig = px.scatter(
                     df, x='x', y='y', 
                     color='category',
                     hover_data=['text'],
+                    render_mode='webgl',
                     title="2D Vector Space Visualization (t-SNE)",
                     labels={'x': 't-SNE 1', 'y': 't-SNE 2'}
                 )
                 
                 # Highlight selected points
                 if 'filtered_results' in locals() and filtered_results:
+                    import plotly.graph_objects as go
                     selected_df = df[df['doc_id'].isin([r['doc_id'] for r in filtered_results])]
-                    fig.add_trace(go.Scatter(
+                    fig.add_trace(go.Scattergl(
                         x=selected_df['x'],
                         y=selected_df['y'],
                         mode='markers',
@@ -469,24 +802,21 @@ def main():
     with tab3:
         st.markdown("### 📋 Data Browser")
         
-        if vectors:
+        if ids:
             # Create DataFrame for display
-            data = []
-            for doc_id, doc_metadata in metadata.items():
-                data.append({
-                    'ID': doc_id,
-                    'Text': doc_metadata['text'],
-                    'Category': doc_metadata['category'],
-                    'Vector Dim': doc_metadata['vector_dim'],
-                    'Created': doc_metadata['created_at'][:19]
-                })
-            
-            df = pd.DataFrame(data)
+            df = pd.DataFrame({
+                'ID': ids,
+                'Text': texts,
+                'Category': categories,
+                'Vector Dim': X.shape[1],
+                'Created': [ts[:19] for ts in created_at]
+            })
             st.dataframe(df, use_container_width=True)
             
             # Category distribution
             st.markdown("### 📊 Category Distribution")
             category_counts = df['Category'].value_counts()
+            import plotly.express as px
             fig = px.pie(values=category_counts.values, names=category_counts.index, title="Vector Categories")
             st.plotly_chart(fig, use_container_width=True)
     
@@ -494,9 +824,30 @@ def main():
         st.markdown("### 🎯 Query History")
         
         if st.session_state.queries:
-            # Display query history
-            for i, query in enumerate(reversed(st.session_state.queries)):
-                with st.expander(f"Query {len(st.session_state.queries) - i} - {query['timestamp'][:19]}"):
+            # Re-run every stored query against the current data in one batch
+            if st.button("🔁 Replay Queries"):
+                replayable = [q for q in st.session_state.queries if 'query_vector' in q]
+                for query in replayable:
+                    queue_query(query['query_vector'])
+                replay_results = flush_queries(top_k)
+                if replay_results:
+                    st.dataframe(pd.DataFrame({
+                        'Query': [q['query_text'] for q in replayable],
+                        'Results': [
+                            sum(r['similarity'] >= similarity_threshold for r in rows)
+                            for rows in replay_results
+                        ],
+                        'Top Similarity': [rows[0]['similarity'] if rows else 0.0 for rows in replay_results]
+                    }), use_container_width=True)
+            
+            # Display the most recent queries
+            total = len(st.session_state.queries)
+            recent = list(islice(st.session_state.queries, 0, QUERY_HISTORY_RENDER))
+            if total > len(recent):
+                st.caption(f"Showing the {len(recent)} most recent of {total} queries")
+            
+            for i, query in enumerate(recent):
+                with st.expander(f"Query {total - i} - {query['timestamp'][:19]}"):
                     col1, col2, col3 = st.columns(3)
                     
                     with col1: